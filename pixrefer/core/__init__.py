@@ -2,12 +2,15 @@
 """Core functionality for the pixrefer package."""
 
 from pixrefer.core.gpt_annotator import GPTAnnotator
-from pixrefer.core.utils import load_config, load_prompt, ensure_dir_exists, load_data
+from pixrefer.core.utils import load_config, load_prompt, ensure_dir_exists, load_data, save_data, dump_json_line, LazyJsonlList
 
 __all__ = [
     'GPTAnnotator',
     'load_config',
     'load_prompt',
     'load_data',
+    'save_data',
+    'dump_json_line',
     'ensure_dir_exists',
+    'LazyJsonlList',
 ] 
\ No newline at end of file
@@ -5,11 +5,53 @@ from typing import Any, Dict, List, Optional, Tuple
 import base64
 import argparse
 from openai import OpenAI
-from pixrefer.core.utils import load_data, load_prompt, load_config
+from pixrefer.core.utils import load_data, load_prompt, load_config, save_data, dump_json_line, ensure_dir_exists
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Suffix of the JSONL log written next to the output JSON file while a run is in progress
+PARTIAL_LOG_SUFFIX = '.partial.jsonl'
+
+
+def _result_key(sample: Dict[str, Any]) -> Tuple[Any, Any]:
+    """Get the key identifying a sample and its annotation result.
+
+    Args:
+        sample: The sample or its annotation result.
+
+    Returns:
+        The (image_id, boxed_image_path) pair of the sample.
+    """
+    return sample.get('image_id'), sample.get('boxed_image_path')
+
+
+def _load_logged_results(log_path: str) -> Dict[Tuple[Any, Any], Dict[str, Any]]:
+    """Load the results logged by an earlier, unfinished run.
+
+    Lines that cannot be parsed, such as one cut off by a crash, are skipped.
+
+    Args:
+        log_path: Path to the JSONL result log.
+
+    Returns:
+        The logged results keyed by _result_key, empty if there is no log.
+    """
+    logged_results = {}
+    if not os.path.exists(log_path):
+        return logged_results
+    with open(log_path, 'rb') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                result = json.loads(line)
+            except ValueError:
+                logger.warning(f"Skipping unreadable line in result log {log_path}")
+                continue
+            logged_results[_result_key(result)] = result
+    return logged_results
+
 
 class GPTAnnotator:
     """A class for annotating images with bounding boxes using GPT models."""
@@ -123,50 +165,89 @@ class GPTAnnotator:
             logger.error(f"Error loading JSON file {json_path}: {e}")
             return []
         
-        # Process each sample
-        for i, sample in enumerate(samples):
+        # Append each result to a JSONL log as soon as it is ready, so finished samples survive a crash.
+        # Samples logged by an earlier, unfinished run are reused instead of annotated again.
+        log_file = None
+        log_path = None
+        logged_results = {}
+        if output_json_path:
+            log_path = f'{os.path.splitext(output_json_path)[0]}{PARTIAL_LOG_SUFFIX}'
             try:
-                image_id = sample["image_id"]
-                logger.info(f"Processing item {i+1}/{len(samples)}: {image_id}")
-                
-                # Get the path to the pre-boxed image
-                boxed_image_path = os.path.join(boxed_image_dir, sample['boxed_image_path'])
-
-                # Prompt number is not None
-                # if prompt_number is None:
-                # rompt_number = str(random.randint(1, 10))
-                prompt_number = sample['prompt_number']
-                if concise is True:
-                    prompt_name = f'box.concise.description{prompt_number}'
-                else:
-                    prompt_name = f'box.regular.description{prompt_number}'
-                print(f'prompt_name: {prompt_name}')
+                output_dir = os.path.dirname(output_json_path)
+                if output_dir:
+                    ensure_dir_exists(output_dir)
+                logged_results = _load_logged_results(log_path)
+                if logged_results:
+                    logger.info(f"Resuming with {len(logged_results)} results from {log_path}")
+                log_file = open(log_path, 'ab')
+                # Start on a new line if the log ends with a line cut off by a crash
+                if log_file.tell() > 0:
+                    with open(log_path, 'rb') as f:
+                        f.seek(-1, os.SEEK_END)
+                        if f.read(1) != b'\n':
+                            log_file.write(b'\n')
+            except OSError as e:
+                logger.error(f"Error opening result log {log_path}, continuing without it: {e}")
+        
+        try:
+            # Process each sample
+            for i, sample in enumerate(samples):
+                logged_result = logged_results.get(_result_key(sample))
+                if logged_result is not None:
+                    results.append(logged_result)
+                    continue
                 try:
-                    prompt = load_prompt(prompt_name)
-                except Exception as e:
-                    logger.error(f'Failed to load prompt. Using default prompt. Error: {e}')
-
-                # Annotate the item
-                description = self.annotate_single_item(
-                    item=sample,
-                    image_path=boxed_image_path,
-                    prompt=prompt,
-                    model=model
-                )
-                # Prepare the result data
-                result = sample
-                result['gpt_description'] = description
-                result['model_info'] = 'gpt-4o'
-                results.append(result)
+                    image_id = sample["image_id"]
+                    logger.info(f"Processing item {i+1}/{len(samples)}: {image_id}")
+                
+                    # Get the path to the pre-boxed image
+                    boxed_image_path = os.path.join(boxed_image_dir, sample['boxed_image_path'])
+
+                    # Prompt number is not None
+                    # if prompt_number is None:
+                    # rompt_number = str(random.randint(1, 10))
+                    prompt_number = sample['prompt_number']
+                    if concise is True:
+                        prompt_name = f'box.concise.description{prompt_number}'
+                    else:
+                        prompt_name = f'box.regular.description{prompt_number}'
+                    logger.debug(f'prompt_name: {prompt_name}')
+                    try:
+                        prompt = load_prompt(prompt_name)
+                    except Exception as e:
+                        logger.error(f'Failed to load prompt. Using default prompt. Error: {e}')
+
+                    # Annotate the item
+                    description = self.annotate_single_item(
+                        item=sample,
+                        image_path=boxed_image_path,
+                        prompt=prompt,
+                        model=model
+                    )
+                    # Prepare the result data
+                    result = sample
+                    result['gpt_description'] = description
+                    result['model_info'] = 'gpt-4o'
+                    results.append(result)
+                    if log_file:
+                        log_file.write(dump_json_line(result))
+                        log_file.flush()
                 
-            except Exception as e:
-                logger.error(f"Error processing sample {i}: {e}")
+                except Exception as e:
+                    logger.error(f"Error processing sample {i}: {e}")
+        finally:
+            # Make sure every logged result is on disk, even if the run is interrupted
+            if log_file:
+                log_file.flush()
+                os.fsync(log_file.fileno())
+                log_file.close()
 
-        # Write all results to a single JSON file
+        # Write all results to a single JSON file, after which the result log is no longer needed
         try:
-            with open(output_json_path, 'w') as out_file:
-                json.dump(results, out_file, indent=2)
+            save_data(results, output_json_path)
             logger.info(f"Results saved to {output_json_path}")
+            if log_file:
+                os.remove(log_path)
         except Exception as e:
             logger.error(f"Error writing results to {output_json_path}: {e}")
     
@@ -207,8 +288,12 @@ def parse_args_and_get_config(
                         help="Maximum number of samples to process")
     parser.add_argument("--model", type=str, 
                         help="GPT model to use")
+    parser.add_argument("--debug", action="store_true",
+                        help="Enable per-sample debug logging")
     
     args = parser.parse_args()
+    if args.debug:
+        logger.setLevel(logging.DEBUG)
     config = load_config()
     
     # Process parameters
@@ -1,11 +1,39 @@
 """Utility functions for loading data and configurations."""
 
 import json
+import math
+import mmap
 import os
 import yaml
 import re
+from collections.abc import Sequence
+from functools import lru_cache
+from itertools import islice
 from typing import Any, Dict, Optional
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from yaml import CSafeLoader as YamlSafeLoader
+except ImportError:
+    from yaml import SafeLoader as YamlSafeLoader
+
+# Package and project locations used by the configuration helpers
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT_ROOT = os.path.dirname(PACKAGE_ROOT)
+PROMPTS_PATH = os.path.join(PACKAGE_ROOT, 'core', 'prompt.yaml')
+DEFAULT_CONFIG_PATH = os.path.join(PROJECT_ROOT, 'config.yaml')
+ENV_FILE_PATH = os.path.join(PROJECT_ROOT, '.env')
+
+# Environment variable references in the format ${VAR}
+ENV_VAR_PATTERN = re.compile(r'\$\{([A-Za-z0-9_]+)\}')
+
+# Number of bytes scanned at a time when indexing the lines of a JSONL file
+LINE_INDEX_BLOCK_SIZE = 64 * 1024 * 1024
+
 
 def load_env_file(env_file_path: str) -> None:
     """ Load the environment variables from the .env file.
@@ -23,21 +51,214 @@ def load_env_file(env_file_path: str) -> None:
                     os.environ[key.strip()] = value.strip()
 
 
-def load_data(data_path: str) -> Any:
+def _loads_json(data: bytes) -> Any:
+    """Parse a JSON document from bytes.
+
+    Uses orjson when it is installed. Documents it rejects, such as ones with the NaN or
+    Infinity literals that save_data writes for non-finite floats, are parsed again with
+    the json module.
+
+    Args:
+        data: The UTF-8 encoded JSON document.
+
+    Returns:
+        The parsed data.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+class LazyJsonlList(Sequence):
+    """A read-only list of JSONL records that are parsed on access.
+
+    The file is memory-mapped and only the byte offsets of its lines are kept in
+    memory, so opening a multi-gigabyte file does not load its records up front.
+    Blank and whitespace-only lines are skipped, as in load_data. Each access parses
+    the record again and returns a new object, so changes to a returned record are
+    not kept. Slices share the memory map of the list they were taken from.
+    """
+
+    def __init__(self, data_path: str, max_items: Optional[int] = None) -> None:
+        """Index the lines of a JSONL file.
+
+        Args:
+            data_path: Path to the JSONL file.
+            max_items: Maximum number of records to expose. If None, exposes all.
+        """
+        # numpy is only needed to index the file, so plain utils imports do not load it
+        import numpy as np
+
+        self._parent = None
+        self._mm = None
+        with open(data_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            # mmap cannot map an empty file
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+
+        starts = np.zeros(1, dtype=np.int64)
+        ends = np.full(1, size, dtype=np.int64)
+        if self._mm is not None:
+            # Find the newlines block by block, so the scan never holds a file-sized array
+            newlines = []
+            for offset in range(0, size, LINE_INDEX_BLOCK_SIZE):
+                block = np.frombuffer(self._mm, dtype=np.uint8,
+                                      count=min(LINE_INDEX_BLOCK_SIZE, size - offset), offset=offset)
+                newlines.append(np.flatnonzero(block == ord('\n')) + offset)
+                del block
+            newlines = np.concatenate(newlines)
+            starts = np.concatenate((starts, newlines + 1))
+            ends = np.concatenate((newlines, ends))
+
+        keep = ends > starts
+        if self._mm is not None:
+            # Records start with a non-whitespace byte, so only lines starting with
+            # whitespace can be blank and need their full contents checked
+            contents = np.frombuffer(self._mm, dtype=np.uint8)
+            first_bytes = contents[np.minimum(starts, size - 1)]
+            del contents
+            maybe_blank = keep & np.isin(first_bytes, list(b' \t\r\f\v'))
+            for i in np.flatnonzero(maybe_blank):
+                keep[i] = bool(self._mm[starts[i]:ends[i]].strip())
+        self._starts = starts[keep][:max_items]
+        self._ends = ends[keep][:max_items]
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            view = object.__new__(LazyJsonlList)
+            view._mm = self._mm
+            # Keep the list that owns the memory map alive while the slice is in use
+            view._parent = self if self._parent is None else self._parent
+            view._starts = self._starts[index]
+            view._ends = self._ends[index]
+            return view
+        return _loads_json(self._mm[self._starts[index]:self._ends[index]])
+
+    def close(self) -> None:
+        """Close the memory map, including for all slices that share it."""
+        if self._mm is not None and not self._mm.closed:
+            self._mm.close()
+
+    def __enter__(self) -> 'LazyJsonlList':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        # Slices never own the memory map
+        if getattr(self, '_parent', True) is None:
+            self.close()
+
+
+def load_data(data_path: str, max_items: Optional[int] = None, lazy: bool = False) -> Any:
     """Load data from a JSON / JSONL file.
     
+    Uses orjson when it is installed and falls back to the standard json module otherwise,
+    or for documents orjson rejects, such as ones with NaN or Infinity literals.
+    
     Args:
         data_path: Path to the JSON file.
+        max_items: Maximum number of records to read from a JSONL file. Reading stops
+            once it is reached, so the rest of the file is never parsed. If None, reads all.
+        lazy: Whether to return a JSONL file as a LazyJsonlList that parses each record
+            on access instead of a list. Has no effect on JSON files. Defaults to False.
 
     Returns:
         The loaded data.
     """
     if data_path.endswith('.jsonl'):
-        with open(data_path, 'r', encoding='utf-8') as f:
-            return [json.loads(line) for line in f]
+        if lazy:
+            return LazyJsonlList(data_path, max_items=max_items)
+        with open(data_path, 'rb') as f:
+            return list(islice((_loads_json(line) for line in f if line.strip()), max_items))
+    
+    if orjson is not None:
+        with open(data_path, 'rb') as f:
+            return _loads_json(f.read())
+    with open(data_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _has_non_finite_float(obj: Any) -> bool:
+    """Check whether the object contains a NaN or infinite float.
+
+    orjson writes such values as null, while the json module writes NaN / Infinity.
+
+    Args:
+        obj: The object to check, which can be a dictionary, list, or basic type.
+
+    Returns:
+        True if a non-finite float is found, False otherwise.
+    """
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        return any(_has_non_finite_float(value) for value in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return any(_has_non_finite_float(item) for item in obj)
+    return False
+
+
+def _use_orjson(data: Any) -> bool:
+    """Check whether data can be serialized with orjson to the same JSON as the json module.
+
+    Args:
+        data: The data to serialize.
+
+    Returns:
+        True if orjson is installed and the data has no NaN or infinite floats.
+    """
+    return orjson is not None and not _has_non_finite_float(data)
+
+
+def save_data(data: Any, data_path: str, pretty: bool = True) -> None:
+    """Save data to a JSON file.
+
+    Uses orjson when it is installed and falls back to the standard json module otherwise,
+    or when the data contains NaN or infinite floats, which only the json module keeps.
+    Non-string dictionary keys are written as strings by both.
+
+    Args:
+        data: The data to save.
+        data_path: Path to the output JSON file.
+        pretty: Whether to indent the output by two spaces. If False, the data is
+            written as a single compact line. Defaults to True.
+    """
+    if _use_orjson(data):
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        with open(data_path, 'wb') as f:
+            f.write(orjson.dumps(data, option=option))
     else:
-        with open(data_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        with open(data_path, 'w', encoding='utf-8') as f:
+            if pretty:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            else:
+                json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+
+
+def dump_json_line(data: Any) -> bytes:
+    """Serialize data as a single UTF-8 encoded JSON line for JSONL files.
+
+    Uses orjson under the same conditions as save_data.
+
+    Args:
+        data: The data to serialize.
+
+    Returns:
+        The JSON encoded data, terminated by a newline.
+    """
+    if _use_orjson(data):
+        return orjson.dumps(data, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return (json.dumps(data, ensure_ascii=False) + '\n').encode('utf-8')
 
 
 def _replace_env_vars(obj: Any) -> Any:
@@ -54,24 +275,27 @@ def _replace_env_vars(obj: Any) -> Any:
     elif isinstance(obj, list):
         return [_replace_env_vars(item) for item in obj]
     elif isinstance(obj, str):
-        # Find environment variable references in the format ${VAR}
-        pattern = r'\$\{([A-Za-z0-9_]+)\}'
-        matches = re.findall(pattern, obj)
-        
-        # If environment variable references are found, replace them
-        if matches:
-            result = obj
-            for var_name in matches:
-                env_value = os.environ.get(var_name)
-                if env_value is not None:
-                    placeholder = f'${{{var_name}}}'
-                    result = result.replace(placeholder, env_value)
-            return result
-        return obj
+        # Replace environment variable references in one pass, keeping unset ones as they are
+        return ENV_VAR_PATTERN.sub(lambda m: os.environ.get(m.group(1), m.group(0)), obj)
     else:
         return obj
 
 
+@lru_cache(maxsize=32)
+def _parse_yaml_file(file_path: str, mtime: float) -> Any:
+    """Parse a YAML file, caching the result per file path and modification time.
+    
+    Args:
+        file_path: Path to the YAML file.
+        mtime: Modification time of the file, so edited files are parsed again.
+
+    Returns:
+        The parsed data. It is shared between calls and must not be modified.
+    """
+    with open(file_path, 'r', encoding='utf-8') as file:
+        return yaml.load(file, Loader=YamlSafeLoader)
+
+
 def load_yaml_file(file_path: str, key_path: Optional[str] = None) -> Any:
     """Load data from a YAML file, optionally accessing a nested key.
     
@@ -88,10 +312,9 @@ def load_yaml_file(file_path: str, key_path: Optional[str] = None) -> Any:
         KeyError: If the specified key doesn't exist.
     """
     try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            data = yaml.safe_load(file)
+        data = _parse_yaml_file(file_path, os.path.getmtime(file_path))
         
-        # Replace all environment variable references
+        # Replace all environment variable references, which also copies the cached data
         data = _replace_env_vars(data)
         
         if key_path:
@@ -108,20 +331,15 @@ def load_yaml_file(file_path: str, key_path: Optional[str] = None) -> Any:
 
 # Wrapper functions for specific configurations
 def get_project_prompt(config_path: Optional[str] = None, prompt_name: Optional[str] = None) -> Any:
-    package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    prompts_path = os.path.join(package_root, 'core', 'prompt.yaml')
-    return load_yaml_file(prompts_path, prompt_name)
+    return load_yaml_file(PROMPTS_PATH, prompt_name)
 
 
 def get_project_config(config_path: Optional[str] = None, config_name: Optional[str] = None) -> Any:
     if config_path is None:
-        package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        project_root = os.path.dirname(package_root)
-        config_path = os.path.join(project_root, 'config.yaml')
+        config_path = DEFAULT_CONFIG_PATH
         
         # Check if the .env file exists, and load it if it does
-        env_file_path = os.path.join(project_root, '.env')
-        load_env_file(env_file_path)
+        load_env_file(ENV_FILE_PATH)
         
     return load_yaml_file(config_path, config_name)
 
@@ -141,5 +359,4 @@ def ensure_dir_exists(directory_path):
     Args:
         directory_path: Path to the directory to ensure exists.
     """
-    if not os.path.exists(directory_path):
-        os.makedirs(directory_path)
\ No newline at end of file
+    os.makedirs(directory_path, exist_ok=True)
\ No newline at end of file
@@ -4,12 +4,139 @@ This module provides a base class for pixel-related interfaces with common funct
 such as image display, zooming, and layout configuration.
 """
 
+import logging
 import os
 import tkinter as tk
+from concurrent.futures import Future, ThreadPoolExecutor
 from tkinter import scrolledtext, ttk, messagebox
-from typing import Optional, Callable, Any
+from typing import Optional, Callable, Any, Dict, Tuple
 from PIL import Image, ImageTk
 
+try:
+    from pic_scale import Resampling as FastResampling, resize as fast_resize
+except ImportError:
+    fast_resize = None
+
+logger = logging.getLogger(__name__)
+
+# Number of display sizes whose scaled image is kept in memory
+SCALED_CACHE_SIZE = 4
+
+# Delay in milliseconds after the last zoom before a bilinear preview is replaced with LANCZOS
+ZOOM_SETTLE_MS = 150
+
+# Interval in milliseconds for checking whether a background resize has finished
+REFINE_POLL_MS = 20
+
+# Downscales by at least this factor first shrink with an integer box reduce before resampling
+REDUCING_GAP = 3.0
+
+# Image modes supported by the pic-scale resizer
+FAST_RESIZE_MODES = ('L', 'LA', 'RGB', 'RGBA')
+
+
+def _fast_resize_works() -> bool:
+    """Check once that the installed pic-scale backend resizes PIL images as expected.
+    
+    Guards against pic-scale versions whose API differs from the one used here, which
+    would otherwise break every resize.
+    
+    Returns:
+        True if a small test resize returns a PIL image of the requested size and mode.
+    """
+    try:
+        for mode in FAST_RESIZE_MODES:
+            result = fast_resize(Image.new(mode, (8, 6)), (4, 3), FastResampling.LANCZOS)
+            if not isinstance(result, Image.Image) or result.size != (4, 3) or result.mode != mode:
+                return False
+    except Exception:
+        return False
+    return True
+
+
+if fast_resize is not None and not _fast_resize_works():
+    logger.warning('The installed pic-scale package does not work as expected, using Pillow for resizing')
+    fast_resize = None
+
+
+def resize_lanczos(image: Image.Image, size: Tuple[int, int]) -> Image.Image:
+    """Resize an image with a LANCZOS filter.
+    
+    Uses the SIMD pic-scale backend when it is installed and supports the image mode,
+    and falls back to Pillow otherwise. Large downscales in Pillow go through a box
+    reduce first, which cuts the pixels the LANCZOS pass has to read.
+    
+    Args:
+        image: The image to resize.
+        size: The target (width, height).
+        
+    Returns:
+        The resized image.
+    """
+    if fast_resize is not None and image.mode in FAST_RESIZE_MODES:
+        return fast_resize(image, size, FastResampling.LANCZOS)
+    return image.resize(size, Image.Resampling.LANCZOS, reducing_gap=REDUCING_GAP)
+
+
+# Single worker shared by all interfaces for LANCZOS resizes that run off the Tk thread
+RESIZE_EXECUTOR = ThreadPoolExecutor(max_workers=1)
+
+# Single worker shared by all interfaces for decoding images off the Tk thread
+DECODE_EXECUTOR = ThreadPoolExecutor(max_workers=1)
+
+# Decodes started ahead of time by prefetch_image, keyed by image path
+_prefetched_images: Dict[str, Future] = {}
+
+
+def decode_image(image: Image.Image) -> Image.Image:
+    """Decode an image and convert it once to a mode that PhotoImage can take as is.
+    
+    Args:
+        image: The opened, not yet decoded image.
+        
+    Returns:
+        The decoded image in RGB or RGBA mode.
+    """
+    image.load()
+    if image.mode not in ('RGB', 'RGBA'):
+        has_alpha = image.mode in ('LA', 'PA') or 'transparency' in image.info
+        image = image.convert('RGBA' if has_alpha else 'RGB')
+    return image
+
+
+def load_image(image_path: str) -> Image.Image:
+    """Open and decode an image file.
+    
+    Args:
+        image_path: Path to the image file.
+        
+    Returns:
+        The decoded image in RGB or RGBA mode.
+    """
+    return decode_image(Image.open(image_path))
+
+
+def prefetch_image(image_path: str) -> None:
+    """Start decoding an image in the background, so an interface opened for it later starts faster.
+    
+    Only the most recent prefetch is kept; decodes for other paths that were never
+    opened are dropped, so they do not hold full-resolution images in memory.
+    
+    Args:
+        image_path: Path to the image file.
+    """
+    for stale_path in [path for path in _prefetched_images if path != image_path]:
+        _prefetched_images.pop(stale_path).cancel()
+    if image_path not in _prefetched_images:
+        _prefetched_images[image_path] = DECODE_EXECUTOR.submit(load_image, image_path)
+
+
+def clear_prefetched_images() -> None:
+    """Drop all prefetched decodes that no interface has used."""
+    for future in _prefetched_images.values():
+        future.cancel()
+    _prefetched_images.clear()
+
 
 class BaseInterface:
     """Base class for pixel-related interfaces.
@@ -25,7 +152,8 @@ class BaseInterface:
         initial_scale: float = 0.5,
         on_complete_callback: Optional[Callable[[], None]] = None,
         current_position: Optional[int] = None,
-        total_images: Optional[int] = None
+        total_images: Optional[int] = None,
+        master: Optional[tk.Tk] = None
     ) -> None:
         """Initialize the base interface with an image.
         
@@ -36,13 +164,23 @@ class BaseInterface:
             on_complete_callback: Function to call when the interface is closed or task is completed.
             current_position: Current position in a batch process (1-based).
             total_images: Total number of images in a batch process.
+            master: Long-lived root window to open this interface in as a Toplevel. If None,
+                the interface creates and runs its own Tk root.
         """
-        # Load the image
-        self.original_image = Image.open(image_path)
+        # Decode the image in the background while the window is built, reusing a prefetched decode if any.
+        # Only the header is needed up front; original_image waits for the decode.
+        self._image_future: Optional[Future] = _prefetched_images.pop(image_path, None)
+        if self._image_future is None:
+            image = Image.open(image_path)
+            self._image_future = DECODE_EXECUTOR.submit(decode_image, image)
+            image_size = image.size
+        else:
+            with Image.open(image_path) as header:
+                image_size = header.size
         self.image_path = image_path
         self.image_name = os.path.basename(image_path)
-        self.width, self.height = self.original_image.size
-        print(f'Init: width: {self.width}, height: {self.height}')
+        self.width, self.height = image_size
+        logger.debug(f'Init: width: {self.width}, height: {self.height}')
         
         # Set scaling factor for calculation
         self.scale_factor = initial_scale
@@ -51,12 +189,26 @@ class BaseInterface:
         # Store callback
         self.on_complete_callback = on_complete_callback
         
+        # Cache of the scaled original image per display size
+        self._scaled_cache: Dict[Tuple[int, int], Image.Image] = {}
+        # Tk photo image shown in the image label, reused while its size is unchanged
+        self.photo_image = None
+        # Display size at which the unmodified scaled original is currently shown, if it is
+        self._displayed_base_size: Optional[Tuple[int, int]] = None
+        # Whether an idle-time redraw of the image has been scheduled
+        self._redraw_pending = False
+        # Pending after() job that replaces a zoom preview with the high quality image
+        self._refine_job = None
+        # Whether the bilinear zoom preview is what is currently on screen
+        self._showing_preview = False
+        
         # Update title with position information if provided
         if current_position is not None and total_images is not None:
             title += f' ({current_position} / {total_images})'
         
-        # Set up the main window
-        self.root = tk.Tk()
+        # Set up the main window, reusing the Tk interpreter of the master window if one is given
+        self.master = master
+        self.root = tk.Tk() if master is None else tk.Toplevel(master)
         # self.root.mainloop()
         self.root.withdraw()  # Hide window initially until positioned
         self.root.title(title)
@@ -86,8 +238,7 @@ class BaseInterface:
         # Set window close protocol
         self.root.protocol('WM_DELETE_WINDOW', self.on_closing)
         
-        # Center window before showing it
-        self.root.update_idletasks()  # Ensure all widgets are updated
+        # Center window before showing it; center_window brings pending layout up to date first
         self.center_window()
         self.root.deiconify()  # Show window after positioning
     
@@ -204,14 +355,6 @@ class BaseInterface:
                 lambda e: self.control_canvas.configure(scrollregion=self.control_canvas.bbox('all'))
             )
             self.control_canvas.bind('<Configure>', self._on_control_canvas_configure)
-            
-            # Bind mouse wheel events to control panel
-            self.control_canvas.bind('<MouseWheel>', self._on_control_mousewheel)  # Windows
-            self.control_canvas.bind('<Button-4>', self._on_control_mousewheel_linux_up)  # Linux scroll up
-            self.control_canvas.bind('<Button-5>', self._on_control_mousewheel_linux_down)  # Linux scroll down
-            self.control_frame.bind('<MouseWheel>', self._on_control_mousewheel)
-            self.control_frame.bind('<Button-4>', self._on_control_mousewheel_linux_up)
-            self.control_frame.bind('<Button-5>', self._on_control_mousewheel_linux_down)
         else:
             # Create a vertical layout for landscape images
             # Create frame for the image
@@ -249,38 +392,6 @@ class BaseInterface:
         canvas_width = event.width
         self.control_canvas.itemconfig(self.control_canvas_frame, width=canvas_width)
     
-    def _on_control_mousewheel(self, event: tk.Event) -> None:
-        """Handle control panel mouse wheel events on Windows.
-        
-        Args:
-            event: The mouse wheel event object.
-        """
-        if self.is_portrait:
-            # Calculate scroll direction (negative for up, positive for down)
-            scroll_direction = -1 if event.delta > 0 else 1
-            # Scroll the control panel canvas
-            self.control_canvas.yview_scroll(scroll_direction, 'units')
-    
-    def _on_control_mousewheel_linux_up(self, event: tk.Event) -> None:
-        """Handle control panel mouse wheel event on Linux (Button-4).
-        
-        Args:
-            event: The mouse wheel event object.
-        """
-        if self.is_portrait:
-            # Scroll up (negative direction)
-            self.control_canvas.yview_scroll(-1, 'units')
-    
-    def _on_control_mousewheel_linux_down(self, event: tk.Event) -> None:
-        """Handle control panel mouse wheel event on Linux (Button-5).
-        
-        Args:
-            event: The mouse wheel event object.
-        """
-        if self.is_portrait:
-            # Scroll down (positive direction)
-            self.control_canvas.yview_scroll(1, 'units')
-    
     def _create_tooltip(self) -> None:
         """Create a tooltip label for displaying messages."""
         self.tooltip = ttk.Label(
@@ -292,6 +403,8 @@ class BaseInterface:
             font=('Arial', 10)
         )
         # Tooltip is initially hidden
+        # Pending after() job that hides the tooltip
+        self._tooltip_job = None
     
     def show_tooltip(self, message: str) -> None:
         """Show a temporary tooltip message.
@@ -309,11 +422,17 @@ class BaseInterface:
         # Position the tooltip near the mouse
         self.tooltip.place(x=x+15, y=y+10)
         
-        # Schedule the tooltip to disappear after 1.5 seconds
-        self.root.after(1500, self.hide_tooltip)
+        # Schedule the tooltip to disappear after 1.5 seconds, restarting the timer if it is already shown
+        if self._tooltip_job is not None:
+            self.root.after_cancel(self._tooltip_job)
+        self._tooltip_job = self.root.after(1500, self.hide_tooltip)
         
     def hide_tooltip(self) -> None:
         """Hide the tooltip."""
+        self._tooltip_job = None
+        if not self.root.winfo_exists():
+            # The window was closed while this callback was pending
+            return
         self.tooltip.place_forget()
     
     def _add_zoom_controls(self) -> None:
@@ -368,55 +487,47 @@ class BaseInterface:
         self.root.bind('<Escape>', lambda e: self.on_closing())
         self.root.bind('<Return>', self.handle_enter_key)
         
-        # Add mouse wheel event bindings
+        # Add mouse wheel event bindings once for the whole window and route them to the canvas under the pointer
         # Note: Different operating systems use different wheel events
-        # Windows uses <MouseWheel>, Linux uses <Button-4> and <Button-5>
-        self.canvas.bind('<MouseWheel>', self._on_mousewheel)  # Windows
-        self.canvas.bind('<Button-4>', self._on_mousewheel_linux_up)  # Linux scroll up
-        self.canvas.bind('<Button-5>', self._on_mousewheel_linux_down)  # Linux scroll down
-        
-        # For better user experience, also bind to the image label
-        self.image_label.bind('<MouseWheel>', self._on_mousewheel)
-        self.image_label.bind('<Button-4>', self._on_mousewheel_linux_up)
-        self.image_label.bind('<Button-5>', self._on_mousewheel_linux_down)
-        
-        # To ensure scrolling works throughout the window, also bind to the main frame
-        self.scrollable_frame.bind('<MouseWheel>', self._on_mousewheel)
-        self.scrollable_frame.bind('<Button-4>', self._on_mousewheel_linux_up)
-        self.scrollable_frame.bind('<Button-5>', self._on_mousewheel_linux_down)
+        # Windows and macOS use <MouseWheel>, Linux uses <Button-4> and <Button-5>
+        self.root.bind_all('<MouseWheel>', self._on_mousewheel)
+        self.root.bind_all('<Button-4>', self._on_mousewheel)
+        self.root.bind_all('<Button-5>', self._on_mousewheel)
     
     def _on_mousewheel(self, event: tk.Event) -> None:
-        """Handle mouse wheel events on Windows.
+        """Handle mouse wheel events by scrolling the canvas under the pointer.
         
-        On Windows, event.delta is positive for scrolling up and negative for 
-        scrolling down. The scroll amount is typically a multiple of 120.
+        Scrolls the control panel in portrait mode when the pointer is over it and the main
+        canvas otherwise. Text widgets are left to scroll themselves. On Windows and macOS,
+        event.delta is positive for scrolling up; on Linux, Button-4 scrolls up and Button-5 down.
         
         Args:
             event: The mouse wheel event object.
         """
-        # Calculate scroll amount (negative for up, positive for down, consistent with canvas.yview direction)
-        scroll_direction = -1 if event.delta > 0 else 1
+        try:
+            widget = self.root.winfo_containing(event.x_root, event.y_root)
+        except KeyError:
+            # Pointer is over an internal Tk widget, such as a combobox popdown
+            return
+        
+        # Walk up from the widget under the pointer to the canvas that should scroll
+        target = None
+        control_canvas = getattr(self, 'control_canvas', None)
+        while widget is not None:
+            if isinstance(widget, tk.Text):
+                return
+            if widget is control_canvas or widget is self.canvas:
+                target = widget
+                break
+            widget = widget.master
+        if target is None:
+            return
+        
+        # Calculate scroll direction (negative for up, positive for down, consistent with canvas.yview direction)
+        scroll_direction = -1 if event.num == 4 or event.delta > 0 else 1
         
         # Scroll the canvas, units means scroll by lines
-        self.canvas.yview_scroll(scroll_direction, 'units')
-
-    def _on_mousewheel_linux_up(self, event: tk.Event) -> None:
-        """Handle scroll up events on Linux (Button-4).
-        
-        Args:
-            event: The mouse wheel event object.
-        """
-        # Scroll up (negative direction)
-        self.canvas.yview_scroll(-1, 'units')
-
-    def _on_mousewheel_linux_down(self, event: tk.Event) -> None:
-        """Handle scroll down events on Linux (Button-5).
-        
-        Args:
-            event: The mouse wheel event object.
-        """
-        # Scroll down (positive direction)
-        self.canvas.yview_scroll(1, 'units')
+        target.yview_scroll(scroll_direction, 'units')
     
     def center_window(self) -> None:
         """Center the window on the screen."""
@@ -427,8 +538,7 @@ class BaseInterface:
         width = self.root.winfo_width()
         height = self.root.winfo_height()
         
-        # Debug output  
-        print(f'center_window - Got window size: width: {width}, height: {height}')
+        logger.debug(f'center_window - Got window size: width: {width}, height: {height}')
         
         # If winfo_width/height returns 1, this means the window hasn't been fully rendered yet
         # In this case, use the dimensions we set in _set_initial_window_size
@@ -436,7 +546,7 @@ class BaseInterface:
             if hasattr(self, 'requested_width') and hasattr(self, 'requested_height'):
                 width = self.requested_width
                 height = self.requested_height
-                print(f'Using requested window size: width: {width}, height: {height}')
+                logger.debug(f'Using requested window size: width: {width}, height: {height}')
             else:
                 # If there is no stored requested size, use the estimated dimensions based on the image
                 if self.is_portrait:
@@ -453,54 +563,173 @@ class BaseInterface:
                 width = min(width, max_width)
                 height = min(height, max_height)
                 
-                print(f'Using estimated window size: width: {width}, height: {height}')
+                logger.debug(f'Using estimated window size: width: {width}, height: {height}')
         
         # If window is too tall for the screen, adjust height to 90% of screen
         if height > self.screen_height * 0.9:
             height = int(self.screen_height * 0.9)
-            self.root.geometry(f'{width}x{height}')
         
         # If window is too wide for the screen, adjust width to 90% of screen   
         if width > self.screen_width * 0.9:
             width = int(self.screen_width * 0.9)
-            self.root.geometry(f'{width}x{height}')
             
         # Calculate position
         x = (self.screen_width - width) // 2
         y = (self.screen_height - height) // 2
         
-        # Set the position
-        self.root.geometry(f'+{x}+{y}')
-        print(f'Set window geometry: {width}x{height}+{x}+{y}')
+        # Set the size and position in a single geometry change
+        self.root.geometry(f'{width}x{height}+{x}+{y}')
+        logger.debug(f'Set window geometry: {width}x{height}+{x}+{y}')
+    
+    @property
+    def original_image(self) -> Image.Image:
+        """The decoded original image, waiting for the background decode if needed."""
+        return self._image_future.result()
+    
+    def _get_display_size(self) -> Tuple[int, int]:
+        """Get the size of the image at the current display scale.
+        
+        Returns:
+            The (width, height) of the displayed image.
+        """
+        return (int(self.width * self.display_scale_factor),
+                int(self.height * self.display_scale_factor))
+    
+    def get_scaled_image(self) -> Image.Image:
+        """Get the original image scaled to the current display size.
+        
+        Scaled images are cached per display size, so zooming back to a previous
+        level does not resample again. Callers must copy the result before drawing on it.
+        
+        Returns:
+            The scaled original image.
+        """
+        target_size = self._get_display_size()
+        scaled_image = self._scaled_cache.get(target_size)
+        if scaled_image is None:
+            scaled_image = resize_lanczos(self.original_image, target_size)
+            self._cache_scaled_image(target_size, scaled_image)
+        return scaled_image
+    
+    def _cache_scaled_image(self, size: Tuple[int, int], scaled_image: Image.Image) -> None:
+        """Add a scaled original image to the cache.
+        
+        Args:
+            size: The display size the image was scaled to.
+            scaled_image: The scaled image.
+        """
+        if size not in self._scaled_cache and len(self._scaled_cache) >= SCALED_CACHE_SIZE:
+            # Evict the oldest display size
+            del self._scaled_cache[next(iter(self._scaled_cache))]
+        self._scaled_cache[size] = scaled_image
     
     def update_image_display(self, image: Optional[Image.Image] = None) -> None:
         """Update the image display.
         
         Args:
             image: The image to display. If None, displays the original image.
+                Images already at the display size are shown without resampling.
         """
-        # Use the provided image or the original
-        display_image = image if image is not None else self.original_image.copy()
-        
-        # Resize the image according to display scale factor
-        scaled_image = display_image.resize(
-            (int(self.width * self.display_scale_factor),
-             int(self.height * self.display_scale_factor)),
-            Image.Resampling.LANCZOS
-        )
+        target_size = self._get_display_size()
+        if image is None and self._displayed_base_size == target_size:
+            # The original image is already shown at this size
+            return
+        
+        if image is None:
+            scaled_image = self.get_scaled_image()
+        elif image.size == target_size:
+            scaled_image = image
+        else:
+            # Resize the image according to display scale factor
+            scaled_image = resize_lanczos(image, target_size)
         
-        # Add debug output
-        print(f'Displaying image: Width: {self.width}, Height: {self.height}, Scale: {self.display_scale_factor}')
-        print(f'Scaled size: {int(self.width * self.display_scale_factor)}x{int(self.height * self.display_scale_factor)}')
+        logger.debug(f'Displaying image: Width: {self.width}, Height: {self.height}, Scale: {self.display_scale_factor}')
+        logger.debug(f'Scaled size: {target_size[0]}x{target_size[1]}')
         
-        # Convert to PhotoImage and update the label
-        self.photo_image = ImageTk.PhotoImage(scaled_image)
-        self.image_label.configure(image=self.photo_image)
+        # Update the existing PhotoImage in place if possible, so Tk does not allocate a new image per redraw
+        if self.photo_image is not None and (self.photo_image.width(), self.photo_image.height()) == target_size:
+            self.photo_image.paste(scaled_image)
+        else:
+            self.photo_image = ImageTk.PhotoImage(scaled_image)
+            self.image_label.configure(image=self.photo_image)
+        self._displayed_base_size = target_size if image is None else None
+        self._showing_preview = False
         
         # Update scale label if it exists
         if hasattr(self, 'scale_label'):
             self.scale_label.configure(text=f'Scale: {self.display_scale_factor:.1f}x')
     
+    def _schedule_redraw(self) -> None:
+        """Schedule a redraw of the image for when Tk is idle.
+        
+        Redraw requests made before the redraw runs, such as autorepeated zoom keys,
+        collapse into a single resample.
+        """
+        if self._redraw_pending:
+            return
+        self._redraw_pending = True
+        self.root.after_idle(self._redraw)
+    
+    def _redraw(self) -> None:
+        """Run a scheduled redraw of the image.
+        
+        If the new size has not been scaled with LANCZOS yet, a cheaper bilinear preview is
+        shown first and refined once zooming has settled for ZOOM_SETTLE_MS.
+        """
+        self._redraw_pending = False
+        if not self.root.winfo_exists():
+            # The window was closed while this callback was pending
+            return
+        target_size = self._get_display_size()
+        if target_size in self._scaled_cache:
+            self.update_image_display()
+            return
+        
+        # Preview from the smallest cached image that is still large enough, which touches far fewer pixels
+        larger_sizes = [size for size in self._scaled_cache if size[0] >= target_size[0] and size[1] >= target_size[1]]
+        if larger_sizes:
+            source_image = self._scaled_cache[min(larger_sizes)]
+        else:
+            source_image = self.original_image
+        self.update_image_display(source_image.resize(target_size, Image.Resampling.BILINEAR, reducing_gap=REDUCING_GAP))
+        self._showing_preview = True
+        if self._refine_job is not None:
+            self.root.after_cancel(self._refine_job)
+        self._refine_job = self.root.after(ZOOM_SETTLE_MS, self._refine_redraw)
+    
+    def _refine_redraw(self) -> None:
+        """Replace the bilinear zoom preview with the LANCZOS scaled image.
+        
+        The resize runs on a worker thread so the window stays responsive meanwhile.
+        """
+        self._refine_job = None
+        if not self.root.winfo_exists():
+            # The window was closed while this callback was pending
+            return
+        target_size = self._get_display_size()
+        future = RESIZE_EXECUTOR.submit(resize_lanczos, self.original_image, target_size)
+        self.root.after(REFINE_POLL_MS, self._install_refined_image, future, target_size)
+    
+    def _install_refined_image(self, future: Future, target_size: Tuple[int, int]) -> None:
+        """Show a background LANCZOS resize once it has finished.
+        
+        Results are only cached, not shown, if the user has zoomed away from the size
+        or something else, such as a marker overlay, has replaced the preview meanwhile.
+        
+        Args:
+            future: The pending resize.
+            target_size: The display size being resized to.
+        """
+        if not self.root.winfo_exists():
+            # The window was closed while this callback was pending
+            return
+        if not future.done():
+            self.root.after(REFINE_POLL_MS, self._install_refined_image, future, target_size)
+            return
+        self._cache_scaled_image(target_size, future.result())
+        if self._showing_preview and self._get_display_size() == target_size:
+            self.update_image_display()
+    
     def zoom_in(self, max_scale: float = 0.8) -> None:
         """Increase the zoom level.
 
@@ -509,7 +738,7 @@ class BaseInterface:
         """
         if self.display_scale_factor < max_scale:  # Don't allow too large
             self.display_scale_factor += 0.1
-            self.update_image_display()
+            self._schedule_redraw()
         else:
             self.show_tooltip('Maximum zoom level reached')
     
@@ -521,7 +750,7 @@ class BaseInterface:
         """
         if self.display_scale_factor > min_scale:  # Don't allow too small
             self.display_scale_factor -= 0.1
-            self.update_image_display()
+            self._schedule_redraw()
         else:
             self.show_tooltip('Minimum zoom level reached')
     
@@ -535,14 +764,17 @@ class BaseInterface:
                 self.on_complete_callback()
     
     def run(self) -> None:
-        """Run the main application loop."""
-        self.root.mainloop()
+        """Run the main application loop, or wait for the window to close when it has a master."""
+        if self.master is None:
+            self.root.mainloop()
+        else:
+            self.root.wait_window()
     
     def _set_initial_window_size(self) -> None:
         """Set an appropriate initial window size based on image and controls."""
-        # Calculate the scaled dimensions of the image
-        scaled_width = int(self.width * self.scale_factor)
-        scaled_height = int(self.height * self.scale_factor)
+        # Use the scaled dimensions computed in _configure_base_layout
+        scaled_width = self.scaled_width
+        scaled_height = self.scaled_height
         
         # Add padding and space for controls
         if self.is_portrait:
@@ -569,7 +801,7 @@ class BaseInterface:
         
         # Set window size
         self.root.geometry(f'{window_width}x{window_height}')
-        print(f'Set initial window size: {window_width}x{window_height}')
+        logger.debug(f'Set initial window size: {window_width}x{window_height}')
     
     def update_status(self, message: str) -> None:
         """Update the status bar message.
@@ -11,22 +11,19 @@ It is based on the mask description evaluator but with simplified interaction.
 """
 
 import argparse
-import json
 import logging
 import os
 import random
+import sys
+import time
 import tkinter as tk
-import traceback
-import numpy as np
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import messagebox, ttk
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
 
-from pixrefer.core.utils import ensure_dir_exists, load_data
-from pixrefer.interface.base_interface import BaseInterface
+from pixrefer.core.utils import LazyJsonlList, ensure_dir_exists, load_data, save_data
+from pixrefer.interface.base_interface import BaseInterface, clear_prefetched_images, prefetch_image
 
-# Set up logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 class SelectionEvaluator(BaseInterface):
@@ -43,7 +40,9 @@ class SelectionEvaluator(BaseInterface):
                 output_dir: str = 'output',
                 on_complete_callback: Optional[callable] = None,
                 current_position: int = None,  # Current position in dataset
-                total_images: int = None) -> None:  # Total number of images
+                total_images: int = None,  # Total number of images
+                master: Optional[tk.Tk] = None,
+                pretty: bool = False) -> None:
         """Initialize the evaluator with image data.
 
         Args:
@@ -54,6 +53,8 @@ class SelectionEvaluator(BaseInterface):
             on_complete_callback: Function to call when evaluation is complete. Optional.
             current_position: Current position in the dataset (1-based). Optional.
             total_images: Total number of images in the dataset. Optional.
+            master: Long-lived root window to open the evaluator in. Optional.
+            pretty: Whether to indent the saved result files. Defaults to False.
         """
         
         # Build title including position information
@@ -70,7 +71,8 @@ class SelectionEvaluator(BaseInterface):
             initial_scale=0.2,  # set to 0.2 for these big images
             on_complete_callback=on_complete_callback,
             current_position=current_position,
-            total_images=total_images
+            total_images=total_images,
+            master=master
         )
 
         # Set up evaluation tracking
@@ -81,6 +83,8 @@ class SelectionEvaluator(BaseInterface):
         # Set up output directory
         self.output_dir = output_dir
         ensure_dir_exists(output_dir)
+        # Write compact single-line results unless indented output was requested
+        self.pretty = pretty
 
         # Flag whether results have been saved
         self.results_saved = False
@@ -102,7 +106,9 @@ class SelectionEvaluator(BaseInterface):
         self.instruction_label.pack(anchor=tk.W if not self.is_portrait else tk.CENTER, pady=(5, 0), fill=tk.X)
 
         # Add binding to update text wrapping
-        self.control_frame.bind('<Configure>', self._update_wraplength)
+        self._last_control_width = None
+        self._wraplength_pending = False
+        self.control_frame.bind('<Configure>', self._on_control_frame_configure)
 
         # Add zoom controls using base class method
         self._add_zoom_controls()
@@ -121,14 +127,15 @@ class SelectionEvaluator(BaseInterface):
         self.randomized_options = self.options.copy()
         random.shuffle(self.randomized_options)
         
-        # Create a button for each option based on interface orientation
+        # Create a button for each option based on interface orientation.
+        # Commands look up the option by button position, so reshuffling only has to update the texts.
         if self.is_portrait:
             # For portrait mode, buttons are stacked vertically
-            for option in self.randomized_options:
+            for i, option in enumerate(self.randomized_options):
                 btn = ttk.Button(
                     self.options_frame,
                     text=option,
-                    command=lambda opt=option: self.handle_option_selection(opt)
+                    command=lambda index=i: self.handle_option_selection(self.randomized_options[index])
                 )
                 btn.pack(fill=tk.X, pady=5)
                 self.option_buttons.append(btn)
@@ -146,7 +153,7 @@ class SelectionEvaluator(BaseInterface):
                 btn = ttk.Button(
                     row_frame,
                     text=option,
-                    command=lambda opt=option: self.handle_option_selection(opt)
+                    command=lambda index=i: self.handle_option_selection(self.randomized_options[index])
                 )
                 btn.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
                 self.option_buttons.append(btn)
@@ -181,15 +188,12 @@ class SelectionEvaluator(BaseInterface):
         # Reset selected option
         self.selected_option = None
         
-        # Re-randomize the options
-        self.randomized_options = self.options.copy()
+        # Re-randomize the options in place
         random.shuffle(self.randomized_options)
         
         # Update button texts with new randomized options
         for i, btn in enumerate(self.option_buttons):
             btn.config(text=self.randomized_options[i], state=tk.NORMAL)
-            # Reset command to new option
-            btn.config(command=lambda opt=self.randomized_options[i]: self.handle_option_selection(opt))
         
         # Disable save button until option is selected
         self.save_continue_button.config(state=tk.DISABLED)
@@ -203,15 +207,10 @@ class SelectionEvaluator(BaseInterface):
         # Store the selected option
         self.selected_option = option
         
-        # Update visual state of all buttons
-        for btn in self.option_buttons:
-            if btn.cget('text') == option or btn.cget('text') == f"{option} ✓":
-                # Highlight selected button with checkmark
-                btn.config(text=f"{option} ✓")
-            else:
-                # Remove checkmark from other buttons if present
-                original_text = btn.cget('text').replace(" ✓", "")
-                btn.config(text=original_text)
+        # Update visual state of all buttons from the option order instead of reading their texts back from Tk
+        for btn, button_option in zip(self.option_buttons, self.randomized_options):
+            # Highlight the selected button with a checkmark and clear it from the others
+            btn.config(text=f"{button_option} ✓" if button_option == option else button_option)
             
         # Enable the save and continue button
         self.save_continue_button.config(state=tk.NORMAL)
@@ -237,10 +236,10 @@ class SelectionEvaluator(BaseInterface):
 
     def _save_results(self) -> None:
         """Save the evaluation results to a JSON file."""
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        timestamp = time.strftime('%Y%m%d_%H%M%S')
         # Use image ID as part of the filename
         image_id = self.image_data.get('image_id', os.path.splitext(os.path.basename(self.image_path))[0])
-        filename = f'{self.output_dir}/selection_{image_id}.json'
+        filename = os.path.join(self.output_dir, f'selection_{image_id}.json')
         
         eval_item = {
             'selected_option': self.selected_option,
@@ -253,10 +252,8 @@ class SelectionEvaluator(BaseInterface):
             'evaluation_data': eval_item
         }
         
-        # Save results
-        ensure_dir_exists(os.path.dirname(filename))
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(result, f, indent=2, ensure_ascii=False)
+        # Save results; the output directory was created in __init__
+        save_data(result, filename, pretty=self.pretty)
             
         logger.info(f'Evaluation results saved to {filename}')
         self.results_filename = filename
@@ -271,21 +268,14 @@ class SelectionEvaluator(BaseInterface):
                 self.on_complete_callback()
             return
             
-        # If no selection has been made, warn user
+        # Warn about the unsaved image and confirm closing in a single dialog
         if self.selected_option is None:
-            if not messagebox.askyesno('Data Loss Warning', 
-                                     f"You haven't made a selection for this image. Data for this image will be lost.\n\nAre you sure you want to close the window?"):
-                # User chose not to close window, continue
-                return
-        # If selection made but not saved
-        elif not self.results_saved:
-            if not messagebox.askyesno('Data Loss Warning', 
-                                     f"You've made a selection but haven't saved it. Data for this image will be lost.\n\nAre you sure you want to close the window?"):
-                # User chose not to close window, continue
-                return
-        
-        # User confirmed close
-        if messagebox.askyesno('Confirm Close', 'Are you sure you want to close? No more images will be shown after closing.'):
+            warning = "You haven't made a selection for this image."
+        else:
+            warning = "You've made a selection but haven't saved it."
+        message = (f'{warning} Data for this image will be lost, and no more images will be shown after closing.'
+                   '\n\nAre you sure you want to close the window?')
+        if messagebox.askyesno('Confirm Close', message):
             # Destroy window
             self.root.destroy()
             
@@ -293,8 +283,25 @@ class SelectionEvaluator(BaseInterface):
             if self.on_complete_callback:
                 self.on_complete_callback(cancelled=True)  # Pass cancelled flag to callback function
 
+    def _on_control_frame_configure(self, event: tk.Event) -> None:
+        """Handle control panel configure events.
+
+        Moves and height-only changes are dropped, and the width changes of a resize are
+        collapsed into a single re-wrap once Tk is idle.
+
+        Args:
+            event: The configure event.
+        """
+        if event.width == self._last_control_width:
+            return
+        self._last_control_width = event.width
+        if not self._wraplength_pending:
+            self._wraplength_pending = True
+            self.root.after_idle(self._update_wraplength)
+
     def _update_wraplength(self, event=None) -> None:
         """Update text wrapping for the instruction label."""
+        self._wraplength_pending = False
         if hasattr(self, 'instruction_label') and self.instruction_label.winfo_exists():
             # Leave some margin (adjust as needed)
             width = self.control_frame.winfo_width() - 20
@@ -309,7 +316,8 @@ class BatchEvaluator:
                  json_path: str, 
                  image_dir: str,
                  output_dir: str,
-                 max_samples: Optional[int] = None) -> None:
+                 max_samples: Optional[int] = None,
+                 pretty: bool = False) -> None:
         """Initialize the batch evaluator.
         
         Args:
@@ -317,21 +325,33 @@ class BatchEvaluator:
             image_dir: Directory containing the images.
             output_dir: Directory to save the evaluation results.
             max_samples: Maximum number of samples to process. If None, processes all.
+            pretty: Whether to indent the saved result files. Defaults to False.
         """
         self.json_path = json_path
         self.image_dir = image_dir
         self.output_dir = output_dir
         self.max_samples = max_samples
+        self.pretty = pretty
         
-        # Load all data items from the JSON file
-        self.data_items = load_data(json_path)
-        logger.info(f'From {json_path} loaded {len(self.data_items)} items')
+        # Scan the output directory in a worker thread while the JSON file is parsed
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            scan_future = executor.submit(self._scan_completed_images)
+            # Load the data items from the JSON file; JSONL records are parsed only when accessed
+            self.data_items = load_data(json_path, max_items=max_samples or None, lazy=True)
+            logger.info(f'From {json_path} loaded {len(self.data_items)} items')
         
         if max_samples and max_samples < len(self.data_items):
             self.data_items = self.data_items[:max_samples]
             
+        # List the image directory once, so image lookups do not stat the file system for every item
+        if os.path.isdir(image_dir):
+            with os.scandir(image_dir) as entries:
+                self._image_names = {entry.name for entry in entries}
+        else:
+            self._image_names = set()
+            
         # Find the index to start from based on already completed images
-        self.current_index = self._find_starting_index()
+        self.current_index = self._find_starting_index(scan_future.result())
         self.total_samples = len(self.data_items)
         
         # Create output directory if it doesn't exist
@@ -340,32 +360,43 @@ class BatchEvaluator:
         # Add flag to control whether to continue processing
         self.should_continue = True
         
-    def _find_starting_index(self) -> int:
+        # Only show blocking error dialogs when run from a terminal, not under automation
+        self.interactive = sys.stdin is not None and sys.stdin.isatty()
+        # Flag whether the batch stopped because of an error
+        self.failed = False
+        
+    def _scan_completed_images(self) -> Set[str]:
+        """Collect the IDs of images that already have a result file.
+        
+        Returns:
+            The set of completed image IDs, empty if the output directory does not exist.
+        """
+        if not os.path.isdir(self.output_dir):
+            return set()
+            
+        # Extract the image ID from each result file in a single directory scan
+        with os.scandir(self.output_dir) as entries:
+            return {
+                entry.name[:-len('.json')].replace('selection_', '')
+                for entry in entries if entry.name.endswith('.json')
+            }
+        
+    def _find_starting_index(self, completed_images: Set[str]) -> int:
         """Find the index from which to start evaluation.
         
-        Checks the output directory for existing result files to determine
+        Uses the existing result files in the output directory to determine
         where to resume evaluation.
         
+        Args:
+            completed_images: IDs of the images that already have a result file.
+        
         Returns:
             The index to start evaluation from.
         """
-        # If output directory doesn't exist, start from beginning
-        if not os.path.exists(self.output_dir):
-            return 0
-            
-        # Get all result files in the output directory
-        result_files = [f for f in os.listdir(self.output_dir) if f.endswith('.json')]
-        
         # If no result files, start from beginning
-        if not result_files:
+        if not completed_images:
             return 0
-            
-        # Extract the image ID for each result file and track completed images
-        completed_images = set()
-        for result_file in result_files:
-            arrowed_image_path = result_file.replace('.json', '').replace('selection_', '')
-            completed_images.add(arrowed_image_path)
-        logger.info(f'Completed images: {completed_images}')
+        logger.info(f'Found {len(completed_images)} completed images')
         
         # Check each data item to see if its image has been evaluated
         for i, item in enumerate(self.data_items):
@@ -389,36 +420,64 @@ class BatchEvaluator:
             return
             
         logger.info(f'Starting from image {self.current_index + 1}/{self.total_samples}')
-        self._process_all_items()
         
+        # Keep one hidden Tk root for the whole batch, so each image only opens a new Toplevel
+        self.root = tk.Tk()
+        self.root.withdraw()
+        try:
+            self._process_all_items()
+        finally:
+            self.root.destroy()
+            # Free the next image if the batch stopped before it was shown
+            clear_prefetched_images()
+            # Release the memory-mapped dataset file
+            if isinstance(self.data_items, LazyJsonlList):
+                self.data_items.close()
+        
+    def _get_image_path(self, data_item: Dict[str, Any]) -> Optional[str]:
+        """Get the image path for a data item.
+        
+        Args:
+            data_item: The data item to get the image path for.
+            
+        Returns:
+            The path to the item's image, or None if it has neither an existing arrowed image nor an image_id.
+        """
+        # Get image path from data or construct it
+        if 'arrowed_image_path' in data_item:
+            arrowed_image_path = data_item['arrowed_image_path']
+            image_path = os.path.join(self.image_dir, arrowed_image_path)
+            # Names missing from the listing are checked on disk, which covers paths in subdirectories
+            # and names that differ only in case on case-insensitive file systems
+            if arrowed_image_path in self._image_names or os.path.exists(image_path):
+                return image_path
+        
+        # Fallback to constructing path from image_id
+        image_id = data_item.get('image_id')
+        if not image_id:
+            return None
+        return os.path.join(self.image_dir, f'{image_id}.jpg')
+    
     def _process_all_items(self) -> None:
         """Process all data items in the list."""
         while self.current_index < len(self.data_items) and self.should_continue:
+            # Known before the item is read, since reading a lazily loaded item can fail itself
+            image_id = 'unknown'
             try:
                 # Get the current data item
                 data_item = self.data_items[self.current_index]
+                image_id = data_item.get('image_id', 'unknown')
                 
-                # Get image path from data or construct it      
-                if 'arrowed_image_path' in data_item and os.path.exists(os.path.join(self.image_dir, data_item['arrowed_image_path'])):
-                    image_path = os.path.join(self.image_dir, data_item['arrowed_image_path'])
-                else:
-                    # Fallback to constructing path from image_id
-                    image_id = data_item.get('image_id')
-                    if not image_id:
-                        logger.error(f'Processing item {self.current_index} has no image_id field')
-                        # Terminate the entire process when an error occurs
-                        self.should_continue = False
-                        return
-                    image_path = os.path.join(self.image_dir, f'{image_id}.jpg')        
+                image_path = self._get_image_path(data_item)
+                if image_path is None:
+                    logger.error(f'Processing item {self.current_index} has no image_id field')
+                    # Terminate the entire process when an error occurs
+                    self.should_continue = False
+                    return
                 
-                logger.info(f'Processing file {self.current_index + 1}/{self.total_samples}: {data_item.get("image_id", "unknown")}')
+                logger.info(f'Processing file {self.current_index + 1}/{self.total_samples}: {image_id}')
                 logger.info(f'Image path: {image_path}')
 
-                # Create a temporary root window for non-initial items
-                if self.current_index > 0:
-                    temp_root = tk.Tk()
-                    temp_root.destroy()
-                    
                 # Create a new SelectionEvaluator instance with position information
                 app = SelectionEvaluator(
                     image_path=image_path,
@@ -427,8 +486,20 @@ class BatchEvaluator:
                     output_dir=self.output_dir,
                     on_complete_callback=self._on_evaluation_complete,
                     current_position=self.current_index + 1,  # Current position (1-based)
-                    total_images=self.total_samples  # Total number of images
+                    total_images=self.total_samples,  # Total number of images
+                    master=self.root,
+                    pretty=self.pretty
                 )
+                
+                # Decode the next image in the background while the user works on this one
+                if self.current_index + 1 < len(self.data_items):
+                    try:
+                        next_image_path = self._get_image_path(self.data_items[self.current_index + 1])
+                        if next_image_path is not None:
+                            prefetch_image(next_image_path)
+                    except Exception as e:
+                        # A bad next item is reported when its own turn comes, not blamed on this one
+                        logger.warning(f'Skipping prefetch of item {self.current_index + 1}: {e}')
             
                 # Run the application, this will block until the window is closed
                 app.run()
@@ -437,10 +508,11 @@ class BatchEvaluator:
                     break
             
             except Exception as e:
-                logger.error(f'Error processing item {self.current_index}: {e}')
-                logger.error(traceback.format_exc())
+                logger.exception(f'Error processing item {self.current_index} (image: {image_id}): {e}')
                 # Terminate the entire process when an error occurs
-                messagebox.showerror("Error", f"An error occurred while processing image {self.current_index + 1}:\n{str(e)}\n\nThe program will terminate.")
+                if self.interactive:
+                    messagebox.showerror("Error", f"An error occurred while processing image {self.current_index + 1}:\n{str(e)}\n\nThe program will terminate.")
+                self.failed = True
                 self.should_continue = False
                 return
 
@@ -469,12 +541,17 @@ def main() -> None:
     Handles argument parsing and initializes the SelectionEvaluator with
     the provided parameters.
     """
+    # Set up logging
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    
     parser = argparse.ArgumentParser(description='Evaluate images with fixed selection options.')
     parser.add_argument('--json_path', type=str, help='Path to the JSON file containing image data')
     parser.add_argument('--image_dir', type=str, help='Directory containing images')
     parser.add_argument('--output_dir', type=str, help='Directory to save evaluation results')
     parser.add_argument('--max_samples', type=int, default=None,
     help='Maximum number of samples to process in batch mode')
+    parser.add_argument('--pretty', action='store_true',
+    help='Indent the saved result files instead of writing compact JSON')
 
     args = parser.parse_args()
 
@@ -485,9 +562,12 @@ def main() -> None:
             json_path=args.json_path,
             image_dir=args.image_dir,
             output_dir=args.output_dir,
-            max_samples=args.max_samples
+            max_samples=args.max_samples,
+            pretty=args.pretty
         )
         batch_evaluator.run()
+        if batch_evaluator.failed:
+            sys.exit(1)
         return
     else:
         logger.error('Missing required parameters. Please provide --json_path and --image_dir.')
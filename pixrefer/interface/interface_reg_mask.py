@@ -6,22 +6,19 @@ the highlighted objects. The descriptions are collected and saved for later use.
 """
 
 import argparse
-import json
 import logging
 import os
 import tkinter as tk
 import threading
 import wave
 import traceback
-import time
 import pyaudio
 import sys
 from tkinter import messagebox, scrolledtext, ttk
 from typing import Any, Dict, List, Optional
-from PIL import Image, ImageTk
 
 
-from pixrefer.core.utils import ensure_dir_exists, load_config, load_data
+from pixrefer.core.utils import ensure_dir_exists, load_config, load_data, save_data
 from pixrefer.interface.base_interface import BaseInterface
 from pixrefer.interface.speech2text import SpeechTranscriber, RATE, CHUNK
 
@@ -34,6 +31,8 @@ FORMAT = pyaudio.paInt16
 CHANNELS = 1
 RECORD_SECONDS = 5
 WAVE_OUTPUT_FORMAT = '{}_mask_{}.wav'
+# Largest piece of recorded audio handed to the transcriber at once (four chunks of int16 samples)
+MAX_STREAM_BYTES = CHUNK * 2 * 4
 
 # Speech API key
 config = load_config()
@@ -133,12 +132,14 @@ class MaskRegionDescriptionCollector(BaseInterface):
         self.is_recording = False
         self.recording_thread = None
         self.audio_stream = None
-        self.frames = []
+        # Recorded audio is appended to one buffer; the condition wakes the transcription stream
+        self.audio_buffer = bytearray()
+        self.audio_condition = threading.Condition()
         self.p = None
         self.transcription_started = False
         
-        # Create speech transcriber
-        self.transcriber = SpeechTranscriber(api_key=API_KEY)
+        # Speech transcriber is created per recording in start_transcription
+        self.transcriber = None
         self.transcription_thread = None
         
         # Add collection-specific UI elements
@@ -169,8 +170,9 @@ class MaskRegionDescriptionCollector(BaseInterface):
         # Set text wrapping after interface creation
         self.root.after(100, self.update_text_wrapping)
         
-        # Bind widget size change event 
-        self.control_frame.bind('<Configure>', lambda e: self.update_text_wrapping())
+        # Bind widget size change event, ignoring events that do not change the width
+        self._last_control_width = None
+        self.control_frame.bind('<Configure>', self._on_control_frame_configure)
         
         # Add input mode and control frame
         self.input_control_frame = ttk.Frame(self.control_frame)
@@ -396,7 +398,8 @@ class MaskRegionDescriptionCollector(BaseInterface):
         self.record_button.configure(text='Stop Recording')
         
         # Reset recording variables
-        self.frames = []
+        self.audio_buffer = bytearray()
+        self.audio_condition = threading.Condition()
         self.is_recording = True
         self.transcription_started = False
         
@@ -420,8 +423,10 @@ class MaskRegionDescriptionCollector(BaseInterface):
         if not self.is_recording:
             return
             
-        # Set flag to stop recording
-        self.is_recording = False
+        # Set flag to stop recording and wake the transcription stream so it can finish
+        with self.audio_condition:
+            self.is_recording = False
+            self.audio_condition.notify_all()
         
         # Update button text
         if hasattr(self, 'record_button') and self.root.winfo_exists():
@@ -444,8 +449,12 @@ class MaskRegionDescriptionCollector(BaseInterface):
         if hasattr(self, 'transcriber') and self.transcriber:
             final_transcript = self.transcriber.final_transcript
         
+        # Snapshot the recording under the lock, since the recorder thread may not have exited yet
+        with self.audio_condition:
+            audio = bytes(self.audio_buffer)
+        
         # Save the audio file
-        if self.frames:
+        if audio:
             audio_filename = WAVE_OUTPUT_FORMAT.format(self.image_id, self.current_index)
             audio_path = os.path.join(self.output_audio_dir, audio_filename)
             
@@ -453,7 +462,7 @@ class MaskRegionDescriptionCollector(BaseInterface):
                 wf.setnchannels(CHANNELS)
                 wf.setsampwidth(2)  # 2 bytes for 'int16'
                 wf.setframerate(RATE)
-                wf.writeframes(b''.join(self.frames))
+                wf.writeframes(audio)
             
             # Store the audio file path
             if self.current_index < len(self.audio_files):
@@ -502,6 +511,9 @@ class MaskRegionDescriptionCollector(BaseInterface):
 
     def record_audio(self) -> None:
         """Record audio from the microphone."""
+        # Keep references to this recording's buffer in case a new recording replaces them
+        audio_buffer = self.audio_buffer
+        audio_condition = self.audio_condition
         try:
             self.p = pyaudio.PyAudio()
             stream = self.p.open(
@@ -516,7 +528,9 @@ class MaskRegionDescriptionCollector(BaseInterface):
             
             while self.is_recording:
                 data = stream.read(CHUNK, exception_on_overflow=False)
-                self.frames.append(data)
+                with audio_condition:
+                    audio_buffer += data
+                    audio_condition.notify_all()
                 
             stream.stop_stream()
             stream.close()
@@ -529,6 +543,10 @@ class MaskRegionDescriptionCollector(BaseInterface):
             self.status_bar.configure(text=f'Error recording audio: {str(e)}')
             self.is_recording = False
             self.record_button.configure(text='Start Recording')
+        finally:
+            # Let the transcription stream finish if recording stopped on its own
+            with audio_condition:
+                audio_condition.notify_all()
 
     def start_transcription(self) -> None:
         """Start transcription using SpeechTranscriber."""
@@ -550,15 +568,22 @@ class MaskRegionDescriptionCollector(BaseInterface):
                 if hasattr(self, 'root') and self.root.winfo_exists():
                     self.root.after(0, lambda: self.clear_and_update_transcription(text, True))
             
-            # Create a generator to provide audio data from our frames list
+            audio_buffer = self.audio_buffer
+            audio_condition = self.audio_condition
+            
+            # Create a generator to provide audio data from the recording buffer
             def audio_generator():
-                i = 0
-                while self.is_recording or i < len(self.frames):
-                    if i < len(self.frames):
-                        yield self.frames[i]
-                        i += 1
-                    else:
-                        time.sleep(0.1)  # Avoid busy waiting
+                position = 0
+                while True:
+                    with audio_condition:
+                        # Sleep until the recorder appends audio or recording stops
+                        while self.is_recording and position >= len(audio_buffer):
+                            audio_condition.wait()
+                        if position >= len(audio_buffer):
+                            return
+                        data = bytes(audio_buffer[position:position + MAX_STREAM_BYTES])
+                    position += len(data)
+                    yield data
                 
             # Start transcriber with silence detection disabled
             self.transcriber = SpeechTranscriber(
@@ -696,22 +721,9 @@ class MaskRegionDescriptionCollector(BaseInterface):
         # Get the current mask
         current_mask = self.masks[self.current_index]
         
-        # Draw the bounding box on the image
-        image_with_box = Image.open(self.image_path)
-        
-        # Resize the image
-        scaled_image = image_with_box.resize(
-            (int(self.width * self.display_scale_factor),
-             int(self.height * self.display_scale_factor)),
-            Image.Resampling.LANCZOS
-        )
-        
-        # Convert to PhotoImage and update the label
-        self.photo_image = ImageTk.PhotoImage(scaled_image)
-        self.image_label.configure(image=self.photo_image)
-        
-        # Update scale label
-        self.scale_label.configure(text=f'Scale: {self.display_scale_factor:.1f}x')
+        # Show the boxed image, which is decoded once and scaled through the shared cache;
+        # this also updates the scale label and is a no-op when the image is already shown
+        self.update_image_display()
         
         # Reset to TYPE mode by default
         self.current_input_mode = MODE_TEXT
@@ -758,8 +770,7 @@ class MaskRegionDescriptionCollector(BaseInterface):
         
         # Write the updated sample to the JSON file
         try:
-            with open(output_path, 'w') as f:
-                json.dump(self.current_sample, f, indent=2)
+            save_data(self.current_sample, output_path)
             
             logger.info(f'Saved result for {mask_id} to {output_path}')
             self.results_saved = True
@@ -845,6 +856,19 @@ class MaskRegionDescriptionCollector(BaseInterface):
                 text='Please provide at least one description (text or audio) before proceeding.'
             )
 
+    def _on_control_frame_configure(self, event: tk.Event) -> None:
+        """Handle control panel configure events.
+
+        Moves and height-only changes are dropped so text is only re-wrapped when the width changes.
+
+        Args:
+            event: The configure event.
+        """
+        if event.width == self._last_control_width:
+            return
+        self._last_control_width = event.width
+        self.update_text_wrapping()
+
     def update_text_wrapping(self) -> None:
         """Update text widget wrapping settings based on current control panel width."""
         # Get current control panel width
@@ -8,19 +8,18 @@ the click is inside the mask or the distance to the nearest mask point.
 """
 
 import argparse
-import json
 import logging
+import math
 import os
 import tkinter as tk
 import traceback
 import numpy as np
-from datetime import datetime
 from tkinter import messagebox, ttk
 from typing import Any, Dict, List, Tuple, Optional
 
 from PIL import ImageDraw, Image
 
-from pixrefer.core.utils import ensure_dir_exists, load_data
+from pixrefer.core.utils import ensure_dir_exists, load_data, save_data
 from pixrefer.interface.base_interface import BaseInterface
 
 # Set up logging
@@ -106,11 +105,15 @@ class MaskDescriptionEvaluator(BaseInterface):
         self.current_guess = None
         self.current_distance = None
         self.current_in_mask = 0
+        self.current_nearest_point: Optional[Tuple[int, int]] = None
         
         # Add new flags to record "cannot tell" and "multiple match" status
         self.cannot_tell = 0
         self.multiple_match = 0
         
+        # Binary mask of the described object, loaded on the first display
+        self.current_mask: Optional[np.ndarray] = None
+        
         # Start the evaluation
         self.update_display()
 
@@ -229,9 +232,12 @@ class MaskDescriptionEvaluator(BaseInterface):
         
         self.comparison_shown = False
 
-        # Load the current mask for evaluation
-        mask_path = os.path.join(self.mask_dir, self.mask_data['mask_path'])
-        self.current_mask = self._load_mask(mask_path)
+        # Load the current mask for evaluation once; update_display runs again on every re-click and undo
+        if self.current_mask is None:
+            mask_path = os.path.join(self.mask_dir, self.mask_data['mask_path'])
+            self.current_mask = self._load_mask(mask_path)
+            # Coordinates of the mask pixels, used for every distance lookup
+            self._mask_ys, self._mask_xs = np.nonzero(self.current_mask)
 
         # Hide button frame
         self.button_frame.pack_forget()
@@ -297,8 +303,9 @@ class MaskDescriptionEvaluator(BaseInterface):
 
         # Calculate distance to the nearest mask point if not in mask
         if self.current_in_mask == 0:
-            self.current_distance = self._calculate_distance_to_mask(original_x, original_y)
+            self.current_nearest_point, self.current_distance = self._find_nearest_mask_point(original_x, original_y)
         else:
+            self.current_nearest_point = None
             self.current_distance = 0.0  # Inside mask, so distance is 0
 
         # Show only the user's guess first
@@ -307,32 +314,31 @@ class MaskDescriptionEvaluator(BaseInterface):
         # Show guess buttons
         self._show_guess_buttons()
 
-    def _calculate_distance_to_mask(self, x: int, y: int) -> float:
-        """Calculate the minimum distance from a point to the mask.
+    def _find_nearest_mask_point(self, x: int, y: int) -> Tuple[Optional[Tuple[int, int]], float]:
+        """Find the mask pixel nearest to a point.
         
-        Uses a brute-force approach to find the nearest mask pixel.
+        Uses a brute-force approach over the cached mask pixel coordinates, comparing
+        squared integer distances so only the minimum needs a square root.
         
         Args:
             x: X-coordinate of the point.
             y: Y-coordinate of the point.
             
         Returns:
-            The minimum Euclidean distance to any mask pixel.
+            The (x, y) of the nearest mask pixel and the Euclidean distance to it,
+            or (None, inf) if the mask is empty.
         """
-        # Get mask pixel coordinates
-        mask_indices = np.where(self.current_mask)
-        if len(mask_indices[0]) == 0:  # Empty mask
-            return float('inf')
+        if len(self._mask_xs) == 0:  # Empty mask
+            return None, float('inf')
             
-        # Calculate distances to all mask pixels
-        y_coords = mask_indices[0]
-        x_coords = mask_indices[1]
-        
-        # Vectorized distance calculation
-        distances = np.sqrt((x_coords - x)**2 + (y_coords - y)**2)
+        # Vectorized squared distance calculation
+        dx = self._mask_xs - x
+        dy = self._mask_ys - y
+        squared_distances = dx * dx + dy * dy
+        nearest_idx = int(np.argmin(squared_distances))
         
-        # Return the minimum distance
-        return float(np.min(distances))
+        nearest_point = (int(self._mask_xs[nearest_idx]), int(self._mask_ys[nearest_idx]))
+        return nearest_point, math.sqrt(squared_distances[nearest_idx])
 
     def _show_guess_buttons(self) -> None:
         """Show buttons related to the guess."""
@@ -381,15 +387,17 @@ class MaskDescriptionEvaluator(BaseInterface):
         Args:
             guess_loc: The guessed coordinates (x, y).
         """
-        # Create a copy of the original image
-        image_copy = self.original_image.copy()
+        # Draw on a copy of the already scaled image instead of the full-resolution original
+        scale = self.display_scale_factor
+        image_copy = self.get_scaled_image().copy()
         draw = ImageDraw.Draw(image_copy)
 
-        # Draw the guessed location as a blue dot
-        marker_radius = max(5, int(self.display_scale_factor * 3))
+        # Draw the guessed location as a blue dot, keeping its on-screen size unchanged
+        guess_x, guess_y = guess_loc[0] * scale, guess_loc[1] * scale
+        marker_radius = max(5, int(scale * 3)) * scale
         draw.ellipse(
-            [(guess_loc[0] - marker_radius, guess_loc[1] - marker_radius),
-             (guess_loc[0] + marker_radius, guess_loc[1] + marker_radius)],
+            [(guess_x - marker_radius, guess_y - marker_radius),
+             (guess_x + marker_radius, guess_y + marker_radius)],
             fill='blue',
             outline='white'
         )
@@ -465,21 +473,15 @@ class MaskDescriptionEvaluator(BaseInterface):
             distance: The distance to the mask (0 if inside).
             in_mask: Whether the guess is inside the mask (1) or not (0).
         """
-        # Create a copy of the original image
-        image_copy = self.original_image.copy()
+        # Work on the already scaled image instead of the full-resolution original
+        scale = self.display_scale_factor
+        image_copy = self.get_scaled_image().convert('RGBA')
         
-        # Overlay the mask with semi-transparency
+        # Overlay the mask with semi-transparency, filling all mask pixels in a single paste
         mask_overlay = Image.new('RGBA', image_copy.size, (0, 0, 0, 0))
-        draw_overlay = ImageDraw.Draw(mask_overlay)
-        
-        # Draw the mask with green color
-        mask_indices = np.where(self.current_mask)
-        for y, x in zip(mask_indices[0], mask_indices[1]):
-            draw_overlay.point((x, y), fill=(0, 255, 0, 128))  # Semi-transparent green
-            
-        # Convert image to RGBA if it isn't already
-        if image_copy.mode != 'RGBA':
-            image_copy = image_copy.convert('RGBA')
+        mask_image = Image.fromarray(self.current_mask.astype(np.uint8) * 255)
+        mask_image = mask_image.resize(image_copy.size, Image.Resampling.NEAREST)
+        mask_overlay.paste((0, 255, 0, 128), mask=mask_image)  # Semi-transparent green
             
         # Composite the images
         image_copy = Image.alpha_composite(image_copy, mask_overlay)
@@ -492,31 +494,27 @@ class MaskDescriptionEvaluator(BaseInterface):
             # Handle regular guess point case
             draw = ImageDraw.Draw(image_copy)
             
-            # Draw the guessed location as a blue dot
-            marker_radius = max(5, int(self.display_scale_factor * 3))
+            # Draw the guessed location as a blue dot, at scaled coordinates
+            guess_x, guess_y = guess_loc[0] * scale, guess_loc[1] * scale
+            marker_radius = max(5, int(scale * 3)) * scale
             marker_color = 'blue'
             
             draw.ellipse(
-                [(guess_loc[0] - marker_radius, guess_loc[1] - marker_radius),
-                 (guess_loc[0] + marker_radius, guess_loc[1] + marker_radius)],
+                [(guess_x - marker_radius, guess_y - marker_radius),
+                 (guess_x + marker_radius, guess_y + marker_radius)],
                 fill=marker_color,
                 outline='white'
             )
             
             # If not in mask, draw a line to the nearest mask point
             if in_mask == 0 and distance < float('inf'):
-                # Find the nearest mask point
-                mask_indices = np.where(self.current_mask)
-                y_coords = mask_indices[0]
-                x_coords = mask_indices[1]
-                
-                distances = np.sqrt((x_coords - guess_loc[0])**2 + (y_coords - guess_loc[1])**2)
-                nearest_idx = np.argmin(distances)
-                
-                nearest_point = (int(x_coords[nearest_idx]), int(y_coords[nearest_idx]))
-                
-                # Draw a line from the guess to the nearest mask point
-                draw.line([guess_loc, nearest_point], fill='red', width=2)
+                # Draw a line from the guess to the nearest mask point found when the guess was made
+                nearest_x, nearest_y = self.current_nearest_point
+                draw.line(
+                    [(guess_x, guess_y), (nearest_x * scale, nearest_y * scale)],
+                    fill='red',
+                    width=max(1, round(2 * scale))
+                )
 
         # Update image display
         self.update_image_display(image_copy)
@@ -585,10 +583,9 @@ class MaskDescriptionEvaluator(BaseInterface):
 
     def _save_results(self) -> None:
         """Save the evaluation results to a JSON file."""
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         # Use image name (without extension) as part of the filename
         mask_name = os.path.splitext(os.path.basename(self.mask_data['mask_path']))[0]
-        filename = f'{self.output_dir}/mask_{mask_name}.json'
+        filename = os.path.join(self.output_dir, f'mask_{mask_name}.json')
         
         eval_item = {
             'guessed_position': [int(coord) for coord in self.guesses[0]] if isinstance(self.guesses[0], tuple) else self.guesses[0],
@@ -604,10 +601,8 @@ class MaskDescriptionEvaluator(BaseInterface):
             'evaluation_data': eval_item
         }
         
-        # Save results
-        ensure_dir_exists(os.path.dirname(filename))
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(result, f, indent=2, ensure_ascii=False)
+        # Save results; the output directory was created in __init__
+        save_data(result, filename)
             
         logger.info(f'Evaluation results saved to {filename}')
         self.results_filename = filename